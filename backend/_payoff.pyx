@@ -0,0 +1,62 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Cython Payoff Kernels
+
+Optional C implementation of the tournament kernel. The payoff table is
+passed in (the read-only PrisonersDilemmaEnvironment.table) rather than
+stored in a module global, so environments with different payoffs can use
+the kernel concurrently.
+
+Build in place (requires Cython and a C compiler, with OpenMP for prange):
+
+    cythonize -i backend/_payoff.pyx
+
+Without the compiled extension, backend._fastpayoff falls back to NumPy.
+"""
+
+from cython.parallel import prange
+from libc.stdint cimport int8_t, int64_t
+
+import numpy as np
+
+
+cdef inline int64_t pd_payoff(
+    const int64_t[:, :, ::1] table, int8_t a1, int8_t a2, int who
+) noexcept nogil:
+    return table[a1, a2, who]
+
+
+cpdef tuple calculate_payoffs(const int64_t[:, :, ::1] table, int a1, int a2):
+    """Payoffs for one action pair: (player1_payoff, player2_payoff)."""
+    return pd_payoff(table, a1, a2, 0), pd_payoff(table, a1, a2, 1)
+
+
+def run_tournament(const int8_t[:, ::1] histories, const int64_t[:, :, ::1] table):
+    """
+    Round-robin scores for fixed action histories.
+    
+    Rows are split across threads with the GIL released.
+    
+    Args:
+        histories: int8 array (n_players, n_rounds) of actions
+        table: int64 payoff table indexed [action1, action2, player]
+        
+    Returns:
+        int64 array (n_players, n_players); [i, j] is player i's total against j
+    """
+    cdef Py_ssize_t n = histories.shape[0]
+    cdef Py_ssize_t rounds = histories.shape[1]
+    cdef Py_ssize_t i, j, r
+    cdef int64_t total
+    
+    scores = np.zeros((n, n), dtype=np.int64)
+    cdef int64_t[:, ::1] out = scores
+    
+    for i in prange(n, nogil=True, schedule="static"):
+        for j in range(n):
+            # Plain assignment (not +=) keeps total thread-private
+            total = 0
+            for r in range(rounds):
+                total = total + pd_payoff(table, histories[i, r], histories[j, r], 0)
+            out[i, j] = total
+    return scores
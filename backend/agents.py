@@ -4,12 +4,19 @@ Agent Implementations for Prisoners Dilemma
 Contains the base agent class and specific strategy implementations.
 """
 
+import random
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Optional
+
+import numpy as np
 
 from backend.environment import Action
 
 
+# Actions indexed by their 0/1 code
+_ACTIONS = (Action.COOPERATE, Action.DEFECT)
+
+
 class BaseAgent(ABC):
     """
     Abstract base class for Prisoners Dilemma agents.
@@ -25,8 +32,25 @@ class BaseAgent(ABC):
             name: Human-readable name for the agent
         """
         self.name = name
-        self.history: List[Action] = []  # Agent's own action history
-        self.opponent_history: List[Action] = []  # Opponent's action history
+        # No built-in strategy needs more than the previous round
+        self._last_own: Optional[Action] = None  # Agent's last action
+        self._last_opp: Optional[Action] = None  # Opponent's last action
+        self._rounds = 0  # Rounds played so far
+    
+    @property
+    def last_action(self) -> Optional[Action]:
+        """The agent's action in the previous round (None before the first)."""
+        return self._last_own
+    
+    @property
+    def last_opponent_action(self) -> Optional[Action]:
+        """The opponent's action in the previous round (None before the first)."""
+        return self._last_opp
+    
+    @property
+    def rounds_played(self) -> int:
+        """Number of rounds the agent has been updated with."""
+        return self._rounds
     
     @abstractmethod
     def select_action(self) -> Action:
@@ -46,20 +70,22 @@ class BaseAgent(ABC):
             own_action: The action this agent took
             opponent_action: The action the opponent took
         """
-        self.history.append(own_action)
-        self.opponent_history.append(opponent_action)
+        self._last_own = own_action
+        self._last_opp = opponent_action
+        self._rounds += 1
     
     def reset(self) -> None:
         """Reset agent state for a new game."""
-        self.history = []
-        self.opponent_history = []
+        self._last_own = None
+        self._last_opp = None
+        self._rounds = 0
     
     def get_info(self) -> dict:
         """Return agent info for API responses."""
         return {
             "name": self.name,
             "strategy": self.__class__.__name__,
-            "rounds_played": len(self.history)
+            "rounds_played": self._rounds
         }
 
 
@@ -84,12 +110,12 @@ class TitForTatAgent(BaseAgent):
         Returns:
             COOPERATE on first round, then mirrors opponent's last action
         """
-        if len(self.opponent_history) == 0:
+        if self._last_opp is None:
             # First round: always cooperate
             return Action.COOPERATE
         else:
             # Mirror opponent's last action
-            return self.opponent_history[-1]
+            return self._last_opp
 
 
 class AlwaysCooperateAgent(BaseAgent):
@@ -117,8 +143,23 @@ class RandomAgent(BaseAgent):
     
     def __init__(self, name: str = "Random", seed: Optional[int] = None):
         super().__init__(name=name)
-        import random
         self._rng = random.Random(seed)
     
     def select_action(self) -> Action:
-        return self._rng.choice([Action.COOPERATE, Action.DEFECT])
+        return _ACTIONS[self._rng.getrandbits(1)]
+    
+    def select_actions(self, n: int) -> np.ndarray:
+        """
+        Select actions for several rounds at once.
+        
+        The batch generator is seeded from the agent's own RNG, so a seeded
+        agent still produces a reproducible sequence.
+        
+        Args:
+            n: Number of actions to draw
+            
+        Returns:
+            int8 array of n actions encoded 0=cooperate, 1=defect
+        """
+        rng = np.random.default_rng(self._rng.getrandbits(64))
+        return rng.integers(0, 2, size=n, dtype=np.int8)
@@ -35,7 +35,7 @@ app.include_router(router)
 
 # Root endpoint
 @app.get("/")
-def root():
+async def root():
     """Root endpoint with API info."""
     return {
         "name": "Iterated Prisoners Dilemma API",
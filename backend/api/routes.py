@@ -4,14 +4,15 @@ API Route Definitions
 All endpoint definitions for the Prisoners Dilemma game.
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+import orjson
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Response
+from pydantic import BaseModel, Field
 from typing import Literal
 
 from backend.engine.config import SimulationConfig
 from backend.engine.model import GameSession
 from backend.engine.state import GameState
-from backend.api.session import get_session, store_session
+from backend.api.session import get_session, remove_session, store_session
 
 
 # Create router
@@ -21,8 +22,8 @@ router = APIRouter()
 # Request/Response Models
 class InitRequest(BaseModel):
     """Request body for initializing a new game."""
-    num_rounds: int = 10
-    agent_type: str = "tit_for_tat"
+    num_rounds: int = Field(default=10, ge=1, le=100, description="Number of rounds")
+    agent_type: str = Field(default="tit_for_tat", description="Agent strategy type")
 
 
 class StepRequest(BaseModel):
@@ -42,15 +43,31 @@ class StepResponse(BaseModel):
     state: GameState
 
 
+def _state_response(session: GameSession, **fields) -> Response:
+    """
+    Build a JSON response holding extra fields plus the session state under "state".
+    
+    The state is serialized with orjson from the session's pre-serialized
+    history instead of validating the response model field by field.
+    """
+    members = orjson.dumps(fields)[1:-1]
+    if members:
+        members += b","
+    return Response(
+        content=b"{" + members + b'"state":' + session.get_state_json() + b"}",
+        media_type="application/json"
+    )
+
+
 # Endpoints
 @router.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint - verifies backend is running."""
     return {"status": "ok"}
 
 
 @router.post("/simulation/init", response_model=InitResponse)
-def init_simulation(request: InitRequest):
+async def init_simulation(request: InitRequest):
     """
     Initialize a new game session.
     
@@ -58,10 +75,7 @@ def init_simulation(request: InitRequest):
     the initial state including the agent's first action.
     """
     # Create config
-    config = SimulationConfig(
-        num_rounds=request.num_rounds,
-        agent_type=request.agent_type
-    )
+    config = SimulationConfig(num_rounds=request.num_rounds, agent_type=request.agent_type)
     
     # Create session
     session = GameSession.create(config)
@@ -69,44 +83,50 @@ def init_simulation(request: InitRequest):
     # Store session
     store_session(session)
     
-    return InitResponse(
-        session_id=session.session_id,
-        state=session.get_state()
-    )
+    return _state_response(session, session_id=session.session_id)
 
 
 @router.post("/simulation/step", response_model=StepResponse)
-def simulation_step(request: StepRequest):
+async def simulation_step(request: StepRequest, background_tasks: BackgroundTasks):
     """
     Process a human action and advance the game.
     
     The human's action is processed against the agent's pre-selected
     action, payoffs are calculated, and the game advances to the next round.
+    Session data is saved in the background once the final round is played.
+    
+    Finished sessions are removed from the store right away, so stepping a
+    game that is already over returns 404.
     """
-    # Get session
+    # Get session (only unfinished games are stored)
     session = get_session(request.session_id)
     if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Check if game is already over
-    if session.is_game_over():
-        raise HTTPException(status_code=400, detail="Game is already over")
-    
     # Process step
-    new_state = session.step(request.action)
+    session.play_round(request.action)
+    
+    # Game just ended - drop it from memory and save session data
+    # after the response is sent
+    if session.is_game_over():
+        remove_session(session.session_id)
+        background_tasks.add_task(session.save)
     
-    return StepResponse(state=new_state)
+    return _state_response(session)
 
 
 @router.get("/simulation/state/{session_id}", response_model=GameState)
-def get_game_state(session_id: str):
+async def get_game_state(session_id: str):
     """
-    Get the current state of a game session.
+    Get the current state of an unfinished game session.
     
-    Useful for refreshing the frontend or recovering from disconnection.
+    Useful for refreshing the frontend or recovering from disconnection
+    mid-game. Finished games are not kept in memory (their final state is
+    returned by the last step and saved to the session log), so this
+    returns 404 once the final round has been played.
     """
     session = get_session(session_id)
     if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return session.get_state()
+    return Response(content=session.get_state_json(), media_type="application/json")
@@ -2,14 +2,34 @@
 Session Management
 
 In-memory storage for active game sessions.
+
+Sessions are spread over a fixed number of shards, each a dict guarded by
+its own lock, so concurrent requests for different sessions rarely contend.
+Each shard is a bounded LRU: once full, the least recently used session is
+evicted, so memory stays capped on a long-running server.
 """
 
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional
 from backend.engine.model import GameSession
 
 
-# In-memory session store
-_sessions: Dict[str, GameSession] = {}
+# Number of shards (must be a power of two for the mask below)
+N_SHARDS = 16
+_SHARD_MASK = N_SHARDS - 1
+
+# Maximum number of sessions kept in memory (split evenly across shards)
+MAX_SESSIONS = 10_000
+_SHARD_CAPACITY = MAX_SESSIONS // N_SHARDS
+
+# In-memory session store: one (lock, LRU table) pair per shard
+_SHARDS = tuple((threading.Lock(), OrderedDict()) for _ in range(N_SHARDS))
+
+
+def _shard_for(session_id: str):
+    """Return the (lock, table) shard responsible for a session ID."""
+    return _SHARDS[hash(session_id) & _SHARD_MASK]
 
 
 def get_session(session_id: str) -> Optional[GameSession]:
@@ -22,17 +42,27 @@ def get_session(session_id: str) -> Optional[GameSession]:
     Returns:
         The GameSession if found, None otherwise
     """
-    return _sessions.get(session_id)
+    lock, table = _shard_for(session_id)
+    with lock:
+        session = table.get(session_id)
+        if session is not None:
+            table.move_to_end(session_id)
+        return session
 
 
 def store_session(session: GameSession) -> None:
     """
-    Store a session.
+    Store a session, evicting the least recently used one if the shard is full.
     
     Args:
         session: The GameSession to store
     """
-    _sessions[session.session_id] = session
+    lock, table = _shard_for(session.session_id)
+    with lock:
+        table[session.session_id] = session
+        table.move_to_end(session.session_id)
+        if len(table) > _SHARD_CAPACITY:
+            table.popitem(last=False)
 
 
 def remove_session(session_id: str) -> bool:
@@ -45,17 +75,22 @@ def remove_session(session_id: str) -> bool:
     Returns:
         True if session was removed, False if not found
     """
-    if session_id in _sessions:
-        del _sessions[session_id]
-        return True
-    return False
+    lock, table = _shard_for(session_id)
+    with lock:
+        return table.pop(session_id, None) is not None
 
 
 def get_all_sessions() -> Dict[str, GameSession]:
     """Get all active sessions (for debugging)."""
-    return _sessions.copy()
+    sessions: Dict[str, GameSession] = {}
+    for lock, table in _SHARDS:
+        with lock:
+            sessions.update(table)
+    return sessions
 
 
 def clear_all_sessions() -> None:
     """Clear all sessions (for testing)."""
-    _sessions.clear()
+    for lock, table in _SHARDS:
+        with lock:
+            table.clear()
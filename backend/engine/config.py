@@ -1,21 +1,27 @@
 """
 Simulation Configuration
 
-Pydantic models for configuring the Prisoners Dilemma simulation.
+Configuration objects for the Prisoners Dilemma simulation.
+
+These are plain frozen dataclasses: inbound HTTP data is validated by the
+request models in backend/api/routes.py, and SimulationConfig itself only
+runs a cheap bounds check on construction.
 """
 
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 
 
-class PayoffConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PayoffConfig:
     """Configuration for the payoff matrix."""
-    temptation: int = Field(default=5, description="T: Defect while opponent cooperates")
-    reward: int = Field(default=3, description="R: Both cooperate")
-    punishment: int = Field(default=1, description="P: Both defect")
-    sucker: int = Field(default=0, description="S: Cooperate while opponent defects")
+    temptation: int = 5  # T: Defect while opponent cooperates
+    reward: int = 3       # R: Both cooperate
+    punishment: int = 1   # P: Both defect
+    sucker: int = 0       # S: Cooperate while opponent defects
 
 
-class SimulationConfig(BaseModel):
+@dataclass(slots=True, frozen=True)
+class SimulationConfig:
     """
     Configuration for a Prisoners Dilemma simulation.
     
@@ -24,6 +30,16 @@ class SimulationConfig(BaseModel):
         agent_type: Type of agent strategy to use
         payoffs: Payoff matrix configuration
     """
-    num_rounds: int = Field(default=10, ge=1, le=100, description="Number of rounds")
-    agent_type: str = Field(default="tit_for_tat", description="Agent strategy type")
-    payoffs: PayoffConfig = Field(default_factory=PayoffConfig)
+    num_rounds: int = 10
+    agent_type: str = "tit_for_tat"
+    payoffs: PayoffConfig = field(default_factory=PayoffConfig)
+    
+    def __post_init__(self):
+        """
+        Validate the number of rounds.
+        
+        Raises:
+            ValueError: If num_rounds is not between 1 and 100
+        """
+        if not 1 <= self.num_rounds <= 100:
+            raise ValueError(f"num_rounds must be between 1 and 100, got {self.num_rounds}")
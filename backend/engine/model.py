@@ -4,10 +4,15 @@ Game Session Model
 Main orchestrator for the Prisoners Dilemma game.
 """
 
+from dataclasses import asdict
+from functools import lru_cache
 from typing import Optional
 import uuid
 
-from backend.environment import PrisonersDilemmaEnvironment, PayoffMatrix, Action
+import numpy as np
+import orjson
+
+from backend.environment import PrisonersDilemmaEnvironment, PayoffMatrix, Action, action_from_string
 from backend.agents import (
     BaseAgent, 
     TitForTatAgent, 
@@ -15,7 +20,7 @@ from backend.agents import (
     AlwaysDefectAgent,
     RandomAgent
 )
-from backend.engine.config import SimulationConfig
+from backend.engine.config import PayoffConfig, SimulationConfig
 from backend.engine.state import GameState, RoundResult, ActionType
 from backend.logging import save_session_data
 
@@ -28,6 +33,66 @@ AGENT_REGISTRY = {
     "random": RandomAgent,
 }
 
+# Human-readable strategy descriptions, keyed by agent name
+STRATEGY_DESCRIPTIONS = {
+    "TitForTat": "Starts cooperating, then mirrors your last action",
+    "AlwaysCooperate": "Always cooperates",
+    "AlwaysDefect": "Always defects",
+    "Random": "Randomly chooses to cooperate or defect",
+}
+
+# Packed per-round arrays store actions by their Action value (0=cooperate, 1=defect)
+_CODE_TO_ACTION = (Action.COOPERATE, Action.DEFECT)
+_CODE_TO_ACTION_TYPE = (ActionType.COOPERATE, ActionType.DEFECT)
+
+# Agent kinds whose next action the session computes inline
+_AGENT_GENERIC = 0
+_AGENT_ALWAYS_COOPERATE = 1
+_AGENT_ALWAYS_DEFECT = 2
+_AGENT_TIT_FOR_TAT = 3
+_AGENT_RANDOM = 4
+
+_AGENT_KINDS = {
+    AlwaysCooperateAgent: _AGENT_ALWAYS_COOPERATE,
+    AlwaysDefectAgent: _AGENT_ALWAYS_DEFECT,
+    TitForTatAgent: _AGENT_TIT_FOR_TAT,
+    RandomAgent: _AGENT_RANDOM,
+}
+
+
+@lru_cache(maxsize=64)
+def _get_env(payoffs: PayoffConfig) -> PrisonersDilemmaEnvironment:
+    """
+    Get the shared environment for a payoff configuration.
+    
+    Environments are immutable once built, so sessions with the same
+    payoffs can safely share one instance.
+    """
+    payoff_matrix = PayoffMatrix(
+        temptation=payoffs.temptation,
+        reward=payoffs.reward,
+        punishment=payoffs.punishment,
+        sucker=payoffs.sucker
+    )
+    return PrisonersDilemmaEnvironment(payoff_matrix)
+
+
+def _round_json(
+    round_index: int,
+    agent_code: int,
+    human_code: int,
+    agent_payoff: int,
+    human_payoff: int
+) -> bytes:
+    """Serialize one round in the same shape as a RoundResult."""
+    return orjson.dumps({
+        "round_number": round_index + 1,  # 1-indexed for display
+        "agent_action": _CODE_TO_ACTION_TYPE[agent_code],
+        "human_action": _CODE_TO_ACTION_TYPE[human_code],
+        "agent_payoff": agent_payoff,
+        "human_payoff": human_payoff,
+    })
+
 
 class GameSession:
     """
@@ -65,11 +130,27 @@ class GameSession:
         self.current_round = 0
         self.agent_score = 0
         self.human_score = 0
-        self.history: list[RoundResult] = []
+        
+        # Per-round storage as Structure-of-Arrays (column 0: agent, column 1: human).
+        # Actions are encoded 0=cooperate, 1=defect.
+        self._actions = np.zeros((config.num_rounds, 2), dtype=np.int8)
+        self._payoffs = np.zeros((config.num_rounds, 2), dtype=np.int64)
+        
+        # Pre-serialized JSON for each played round, so responses never
+        # re-serialize the whole history
+        self._history_json_parts: list[bytes] = []
         
         # Current round state
         self._pending_agent_action: Optional[Action] = None
         
+        # Built-in strategies pick their actions inline (other agents go
+        # through select_action); every agent is still updated each round
+        self._agent_kind = _AGENT_KINDS.get(type(agent), _AGENT_GENERIC)
+        
+        # Cached GameState and its JSON, cleared whenever the game advances
+        self._state_cache: Optional[GameState] = None
+        self._state_json_cache: Optional[bytes] = None
+        
         # Prepare first round
         self._prepare_round()
     
@@ -80,32 +161,39 @@ class GameSession:
         
         Args:
             config: Simulation configuration
-            session_id: Optional session ID (generated if not provided)
+            session_id: Optional session ID (generated as a 32-character
+                hex UUID4, without hyphens, if not provided)
             
         Returns:
             A new GameSession instance
         """
-        session_id = session_id or str(uuid.uuid4())
+        session_id = session_id or uuid.uuid4().hex
         
         # Create agent
         agent_class = AGENT_REGISTRY.get(config.agent_type, TitForTatAgent)
         agent = agent_class()
         
-        # Create environment with configured payoffs
-        payoff_matrix = PayoffMatrix(
-            temptation=config.payoffs.temptation,
-            reward=config.payoffs.reward,
-            punishment=config.payoffs.punishment,
-            sucker=config.payoffs.sucker
-        )
-        environment = PrisonersDilemmaEnvironment(payoff_matrix)
+        # Get (shared) environment with configured payoffs
+        environment = _get_env(config.payoffs)
         
         return cls(session_id, config, agent, environment)
     
     def _prepare_round(self) -> None:
         """Prepare the next round by having the agent select their action."""
         if self.current_round < self.config.num_rounds:
-            self._pending_agent_action = self.agent.select_action()
+            self._pending_agent_action = self._next_agent_action()
+    
+    def _next_agent_action(self) -> Action:
+        """Select the agent's next action, bypassing the agent for fixed strategies."""
+        kind = self._agent_kind
+        if kind == _AGENT_ALWAYS_COOPERATE:
+            return Action.COOPERATE
+        if kind == _AGENT_ALWAYS_DEFECT:
+            return Action.DEFECT
+        if kind == _AGENT_TIT_FOR_TAT:
+            last_human = self.agent.last_opponent_action
+            return Action.COOPERATE if last_human is None else last_human
+        return self.agent.select_action()
     
     def step(self, human_action_str: str) -> GameState:
         """
@@ -117,11 +205,24 @@ class GameSession:
         Returns:
             Updated game state
         """
+        self.play_round(human_action_str)
+        return self.get_state()
+    
+    def play_round(self, human_action_str: str) -> None:
+        """
+        Process a human action and advance the game without building a GameState.
+        
+        Does nothing if the game is already over.
+        
+        Args:
+            human_action_str: "cooperate" or "defect"
+        """
         if self.is_game_over():
-            return self.get_state()
+            return
         
-        # Parse human action
-        human_action = Action(human_action_str.lower())
+        # Actions are IntEnums, so they double as the stored 0/1 codes
+        # (StepRequest already guarantees a lower-case action string)
+        human_action = action_from_string(human_action_str)
         agent_action = self._pending_agent_action
         
         # Calculate payoffs
@@ -134,29 +235,123 @@ class GameSession:
         self.human_score += human_payoff
         
         # Record round result
-        round_result = RoundResult(
-            round_number=self.current_round + 1,  # 1-indexed for display
-            agent_action=ActionType(agent_action.value),
-            human_action=ActionType(human_action.value),
-            agent_payoff=agent_payoff,
-            human_payoff=human_payoff
+        r = self.current_round
+        self._actions[r] = (agent_action, human_action)
+        self._payoffs[r] = (agent_payoff, human_payoff)
+        self._history_json_parts.append(
+            _round_json(r, agent_action, human_action, agent_payoff, human_payoff)
         )
-        self.history.append(round_result)
         
         # Update agent's knowledge
         self.agent.update(agent_action, human_action)
         
         # Advance to next round
         self.current_round += 1
+        self._state_cache = None
+        self._state_json_cache = None
         
         # Prepare next round if game continues
         if not self.is_game_over():
             self._prepare_round()
+    
+    def run_batch(self, human_actions: np.ndarray) -> np.ndarray:
+        """
+        Play several rounds at once against a built-in agent.
+        
+        Agent actions and payoffs for the whole batch are computed with
+        vectorized NumPy operations instead of one step() call per round.
+        
+        Args:
+            human_actions: Human actions for the next rounds, encoded 0=cooperate, 1=defect
+            
+        Returns:
+            Array of shape (N, 2) with the (agent, human) payoff of each round
+            
+        Raises:
+            ValueError: If the agent is not a built-in strategy, the actions
+                are not integers in {0, 1}, or the batch is longer than the
+                remaining rounds
+        """
+        raw = np.asarray(human_actions)
+        n = len(raw)
+        start = self.current_round
+        kind = self._agent_kind
+        
+        if kind == _AGENT_GENERIC:
+            raise ValueError(f"run_batch requires a built-in agent, got {self.agent.name}")
+        if n > self.config.num_rounds - start:
+            raise ValueError(f"Only {self.config.num_rounds - start} rounds left, got {n} actions")
+        if n == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        # Validate before narrowing to int8, which would wrap or truncate bad values
+        if not np.issubdtype(raw.dtype, np.integer) or raw.min() < 0 or raw.max() > 1:
+            raise ValueError("Human actions must be encoded as 0 (cooperate) or 1 (defect)")
+        h = raw.astype(np.int8)
+        
+        # Agent actions for the whole batch
+        a = np.empty(n, dtype=np.int8)
+        if kind == _AGENT_ALWAYS_COOPERATE:
+            a.fill(0)
+        elif kind == _AGENT_ALWAYS_DEFECT:
+            a.fill(1)
         else:
-            # Game just ended - save session data
-            self._save_session()
+            a[0] = self._pending_agent_action
+            if kind == _AGENT_TIT_FOR_TAT:
+                a[1:] = h[:-1]
+            else:
+                a[1:] = self.agent.select_actions(n - 1)
         
-        return self.get_state()
+        # Payoffs for both players in one gather: table[agent, human] -> (agent, human)
+        pairs = self.environment.table[a, h]
+        
+        # Record rounds and update scores
+        end = start + n
+        self._actions[start:end, 0] = a
+        self._actions[start:end, 1] = h
+        self._payoffs[start:end] = pairs
+        self._history_json_parts.extend(
+            _round_json(start + i, agent_code, human_code, agent_payoff, human_payoff)
+            for i, (agent_code, human_code, (agent_payoff, human_payoff)) in enumerate(
+                zip(a.tolist(), h.tolist(), pairs.tolist())
+            )
+        )
+        totals = pairs.sum(axis=0, dtype=np.int64)
+        self.agent_score += int(totals[0])
+        self.human_score += int(totals[1])
+        # Leave the agent in the same state as step-by-step play
+        update = self.agent.update
+        for agent_code, human_code in zip(a.tolist(), h.tolist()):
+            update(_CODE_TO_ACTION[agent_code], _CODE_TO_ACTION[human_code])
+        self.current_round = end
+        self._state_cache = None
+        self._state_json_cache = None
+        
+        if not self.is_game_over():
+            self._prepare_round()
+        
+        return pairs
+    
+    @property
+    def history(self) -> list[RoundResult]:
+        """
+        Round results played so far.
+        
+        Built on demand from the packed per-round arrays. The values are
+        valid by construction, so Pydantic validation is skipped.
+        """
+        n = self.current_round
+        return [
+            RoundResult.model_construct(
+                round_number=i + 1,  # 1-indexed for display
+                agent_action=_CODE_TO_ACTION_TYPE[agent_code],
+                human_action=_CODE_TO_ACTION_TYPE[human_code],
+                agent_payoff=agent_payoff,
+                human_payoff=human_payoff
+            )
+            for i, ((agent_code, human_code), (agent_payoff, human_payoff)) in enumerate(
+                zip(self._actions[:n].tolist(), self._payoffs[:n].tolist())
+            )
+        ]
     
     def is_game_over(self) -> bool:
         """Check if the game has ended."""
@@ -169,48 +364,73 @@ class GameSession:
         Returns:
             GameState with all current information
         """
-        return GameState(
-            session_id=self.session_id,
-            current_round=self.current_round,
-            total_rounds=self.config.num_rounds,
-            agent_score=self.agent_score,
-            human_score=self.human_score,
-            agent_action=ActionType(self._pending_agent_action.value) if self._pending_agent_action else None,
-            waiting_for_human=not self.is_game_over() and self._pending_agent_action is not None,
-            history=self.history,
-            game_over=self.is_game_over(),
-            agent_name=self.agent.name,
-            agent_strategy=self._get_strategy_description(),
-            payoff_matrix=self.environment.get_payoff_description()
-        )
+        if self._state_cache is None:
+            self._state_cache = self._build_state()
+        return self._state_cache
+    
+    def get_state_json(self) -> bytes:
+        """
+        Get the current game state serialized as JSON.
+        
+        Equivalent to serializing get_state(), but the history is assembled
+        from the per-round fragments recorded as the game was played. The
+        result is cached, so polling between moves costs nothing.
+        
+        Returns:
+            UTF-8 encoded JSON object with the GameState fields
+        """
+        if self._state_json_cache is None:
+            head = orjson.dumps(self._state_fields())
+            self._state_json_cache = (
+                head[:-1]
+                + b',"history":['
+                + b",".join(self._history_json_parts)
+                + b"]}"
+            )
+        return self._state_json_cache
+    
+    def _build_state(self) -> GameState:
+        """
+        Build a fresh GameState from the session's current data.
+        
+        All fields come from the session itself, so Pydantic validation is skipped.
+        """
+        return GameState.model_construct(history=self.history, **self._state_fields())
+    
+    def _state_fields(self) -> dict:
+        """Collect every GameState field except the history."""
+        return {
+            "session_id": self.session_id,
+            "current_round": self.current_round,
+            "total_rounds": self.config.num_rounds,
+            "agent_score": self.agent_score,
+            "human_score": self.human_score,
+            "agent_action": (
+                _CODE_TO_ACTION_TYPE[self._pending_agent_action]
+                if self._pending_agent_action is not None else None
+            ),
+            "waiting_for_human": not self.is_game_over() and self._pending_agent_action is not None,
+            "game_over": self.is_game_over(),
+            "agent_name": self.agent.name,
+            "agent_strategy": self._get_strategy_description(),
+            "payoff_matrix": self.environment.get_payoff_description(),
+        }
     
     def _get_strategy_description(self) -> str:
         """Get a human-readable description of the agent's strategy."""
-        descriptions = {
-            "TitForTat": "Starts cooperating, then mirrors your last action",
-            "AlwaysCooperate": "Always cooperates",
-            "AlwaysDefect": "Always defects",
-            "Random": "Randomly chooses to cooperate or defect",
-        }
-        return descriptions.get(self.agent.name, "Unknown strategy")
+        return STRATEGY_DESCRIPTIONS.get(self.agent.name, "Unknown strategy")
     
-    def _save_session(self) -> None:
-        """Save session data to a JSON file when game ends."""
+    def save(self) -> None:
+        """
+        Save session data to a JSON file.
+        
+        Called once the game is over. Kept out of step() so the API can
+        run the disk write after the final response has been sent.
+        """
         try:
-            config_dict = {
-                "num_rounds": self.config.num_rounds,
-                "agent_type": self.config.agent_type,
-                "payoffs": {
-                    "temptation": self.config.payoffs.temptation,
-                    "reward": self.config.payoffs.reward,
-                    "punishment": self.config.payoffs.punishment,
-                    "sucker": self.config.payoffs.sucker,
-                }
-            }
-            
             filepath = save_session_data(
                 session_id=self.session_id,
-                config=config_dict,
+                config=asdict(self.config),
                 history=self.history,
                 agent_score=self.agent_score,
                 human_score=self.human_score,
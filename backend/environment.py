@@ -5,17 +5,44 @@ Implements the classic iterated prisoners dilemma game logic.
 """
 
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
+from functools import cached_property, lru_cache
 from typing import Tuple
 
+import numpy as np
 
-class Action(str, Enum):
-    """Possible actions in the Prisoners Dilemma."""
-    COOPERATE = "cooperate"
-    DEFECT = "defect"
+from backend._fastpayoff import run_match as _run_match
+from backend._fastpayoff import run_tournament as _run_tournament
 
 
-@dataclass
+class Action(IntEnum):
+    """
+    Possible actions in the Prisoners Dilemma.
+    
+    Values double as indices into the payoff tables.
+    """
+    COOPERATE = 0
+    DEFECT = 1
+
+
+# Lower-case action names to members; Action values are table indices, not names
+_STR_TO_ACTION = {action.name.lower(): action for action in Action}
+
+
+def action_from_string(value: str) -> Action:
+    """
+    Get the action for its lower-case name with a single dict lookup.
+    
+    Args:
+        value: "cooperate" or "defect"
+        
+    Returns:
+        The matching Action
+    """
+    return _STR_TO_ACTION[value]
+
+
+@dataclass(slots=True, frozen=True)
 class PayoffMatrix:
     """
     Classic Prisoners Dilemma payoff matrix.
@@ -25,6 +52,9 @@ class PayoffMatrix:
     - 2R > T + S (Mutual cooperation is better than alternating)
     
     Default values: T=5, R=3, P=1, S=0
+    
+    Instances are immutable (and hashable) once validated, and slotted so
+    sweeps over many matrices carry no per-instance __dict__.
     """
     temptation: int = 5  # T: Defect while opponent cooperates
     reward: int = 3       # R: Both cooperate
@@ -32,11 +62,64 @@ class PayoffMatrix:
     sucker: int = 0       # S: Cooperate while opponent defects
     
     def __post_init__(self):
-        """Validate PD constraints."""
-        assert self.temptation > self.reward > self.punishment > self.sucker, \
-            "Must satisfy T > R > P > S"
-        assert 2 * self.reward > self.temptation + self.sucker, \
-            "Must satisfy 2R > T + S"
+        """
+        Validate PD constraints once, so payoff code can trust them.
+        
+        Raises:
+            ValueError: If T > R > P > S or 2R > T + S does not hold
+        """
+        if not (self.temptation > self.reward > self.punishment > self.sucker):
+            raise ValueError("T>R>P>S violated")
+        if not (2 * self.reward > self.temptation + self.sucker):
+            raise ValueError("2R>T+S violated")
+
+
+@lru_cache(maxsize=128)
+def _payoff_tables(payoff_matrix: PayoffMatrix) -> tuple:
+    """
+    Build the payoff lookup tables for a payoff matrix.
+    
+    Cached per (frozen, hashable) PayoffMatrix, so environments with the same
+    payoffs share one set of tables. The array table is read-only.
+    
+    Returns:
+        Tuple of (flat, table):
+        - flat: payoff pairs indexed by (action1 << 1) | action2
+        - table: int64 array indexed [action1, action2] -> (payoff1, payoff2),
+          for callers that look up payoffs for whole arrays of actions
+    """
+    pm = payoff_matrix
+    flat = (
+        (pm.reward, pm.reward),           # CC
+        (pm.sucker, pm.temptation),       # CD
+        (pm.temptation, pm.sucker),       # DC
+        (pm.punishment, pm.punishment),   # DD
+    )
+    table = np.array(flat, dtype=np.int64).reshape(2, 2, 2)
+    table.flags.writeable = False
+    return flat, table
+
+
+class AgentState:
+    """
+    Per-agent simulation state stored as parallel arrays indexed by agent id.
+    
+    Keeps each field contiguous so whole populations are updated with array
+    operations instead of per-agent attribute access.
+    """
+    
+    def __init__(self, n: int):
+        """
+        Initialize state for n agents, all cooperating with zero score.
+        
+        Args:
+            n: Number of agents
+        """
+        self.last_action = np.zeros(n, dtype=np.int8)
+        self.score = np.zeros(n, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.score)
 
 
 class PrisonersDilemmaEnvironment:
@@ -46,6 +129,13 @@ class PrisonersDilemmaEnvironment:
     The environment calculates payoffs based on both players' actions.
     """
     
+    # Payoff description entries as (player1, player2) payoff labels
+    _DESCRIPTION_TEMPLATE = {
+        "mutual_cooperation": ("R", "R"),
+        "mutual_defection": ("P", "P"),
+        "temptation_vs_sucker": ("T", "S"),
+    }
+    
     def __init__(self, payoff_matrix: PayoffMatrix = None):
         """
         Initialize the environment.
@@ -54,6 +144,9 @@ class PrisonersDilemmaEnvironment:
             payoff_matrix: Custom payoff matrix. Uses default if None.
         """
         self.payoff_matrix = payoff_matrix or PayoffMatrix()
+        
+        # Lookup tables are shared by every environment with equal payoffs
+        self._flat, self.table = _payoff_tables(self.payoff_matrix)
     
     def calculate_payoffs(
         self, 
@@ -64,34 +157,206 @@ class PrisonersDilemmaEnvironment:
         Calculate payoffs for both players.
         
         Args:
-            action1: First player's action
-            action2: Second player's action
+            action1: First player's action (an Action or its 0/1 value)
+            action2: Second player's action (an Action or its 0/1 value)
             
         Returns:
             Tuple of (player1_payoff, player2_payoff)
         """
+        return self._flat[(action1 << 1) | action2]
+    
+    def calculate_payoffs_int(self, action1: int, action2: int) -> Tuple[int, int]:
+        """Calculate payoffs for 0/1-coded actions (same as calculate_payoffs)."""
+        return self.calculate_payoffs(action1, action2)
+    
+    def calculate_payoffs_batch(
+        self,
+        actions1: np.ndarray,
+        actions2: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate payoffs for many action pairs at once.
+        
+        A single gather from the payoff table; prefer this over repeated
+        calculate_payoffs() calls when replaying or simulating whole matches.
+        
+        Args:
+            actions1: First player's actions (0=cooperate, 1=defect)
+            actions2: Second player's actions, same shape as actions1
+            
+        Returns:
+            Tuple of (player1_payoffs, player2_payoffs) arrays
+        """
+        pairs = self.table[actions1, actions2]
+        return pairs[..., 0], pairs[..., 1]
+    
+    def run_match(
+        self,
+        actions1: np.ndarray,
+        actions2: np.ndarray
+    ) -> Tuple[int, int]:
+        """
+        Calculate both players' total payoffs over a whole match.
+        
+        Runs as a single compiled call when Numba is installed.
+        
+        Args:
+            actions1: First player's actions per round (0=cooperate, 1=defect)
+            actions2: Second player's actions, same length as actions1
+            
+        Returns:
+            Tuple of (player1_total, player2_total)
+        """
         pm = self.payoff_matrix
+        return _run_match(
+            actions1, actions2,
+            pm.temptation, pm.reward, pm.punishment, pm.sucker
+        )
+    
+    def play_round(self, players: AgentState, opponents: AgentState) -> None:
+        """
+        Play one round between paired agents and add the payoffs to their scores.
+        
+        Agent i of players meets agent i of opponents, each playing its
+        last_action.
+        
+        Args:
+            players: First agent of each pairing
+            opponents: Second agent of each pairing, same length as players
+        """
+        payoffs1, payoffs2 = self.calculate_payoffs_batch(players.last_action, opponents.last_action)
+        players.score += payoffs1
+        opponents.score += payoffs2
+    
+    def run_tournament(self, histories: np.ndarray) -> np.ndarray:
+        """
+        Score a round-robin tournament between fixed action histories.
+        
+        Runs in the compiled Cython kernel when backend/_payoff.pyx is built.
+        
+        Args:
+            histories: Array (n_players, n_rounds) of actions (0=cooperate, 1=defect)
+            
+        Returns:
+            int64 array (n_players, n_players); [i, j] is player i's total against j
+        """
+        return _run_tournament(histories, self.table)
+    
+    @cached_property
+    def payoff_description(self) -> dict:
+        """
+        Payoff matrix as a dictionary for API responses.
         
-        if action1 == Action.COOPERATE and action2 == Action.COOPERATE:
-            return (pm.reward, pm.reward)
-        elif action1 == Action.DEFECT and action2 == Action.DEFECT:
-            return (pm.punishment, pm.punishment)
-        elif action1 == Action.DEFECT and action2 == Action.COOPERATE:
-            return (pm.temptation, pm.sucker)
-        else:  # action1 == COOPERATE and action2 == DEFECT
-            return (pm.sucker, pm.temptation)
+        Built on first access; the payoff matrix is frozen, so it never changes.
+        """
+        pm = self.payoff_matrix
+        labels = {
+            "T": pm.temptation,
+            "R": pm.reward,
+            "P": pm.punishment,
+            "S": pm.sucker
+        }
+        description = {
+            key: (labels[first], labels[second])
+            for key, (first, second) in self._DESCRIPTION_TEMPLATE.items()
+        }
+        description["labels"] = labels
+        return description
     
     def get_payoff_description(self) -> dict:
         """Return payoff matrix as a dictionary for API responses."""
+        return self.payoff_description
+
+
+class NPlayerPDEnvironment:
+    """
+    Environment for an n-player Prisoners Dilemma with two player types (p and q).
+    
+    Each player plays the two-player game against every other group member
+    and receives the average payoff. A focal player's payoff then depends only
+    on how many players of each type cooperate, not on which ones, so states
+    are clustered by (num_p_coop, num_q_coop): (n_p + 1) * (n_q + 1) states
+    instead of 2^n action profiles.
+    """
+    
+    def __init__(self, num_p: int, num_q: int, payoff_matrix: PayoffMatrix = None):
+        """
+        Initialize the environment.
+        
+        Args:
+            num_p: Number of type-p players
+            num_q: Number of type-q players
+            payoff_matrix: Custom two-player payoff matrix. Uses default if None.
+        """
+        if num_p < 0 or num_q < 0 or num_p + num_q < 2:
+            raise ValueError("Need non-negative type counts and at least 2 players")
+        
+        self.num_p = num_p
+        self.num_q = num_q
+        self.payoff_matrix = payoff_matrix or PayoffMatrix()
+        self._table = self._build_table()
+    
+    def _build_table(self) -> np.ndarray:
+        """
+        Precompute focal payoffs for every clustered state.
+        
+        Returns:
+            Array indexed [focal_is_p, focal_cooperates, num_p_coop, num_q_coop];
+            NaN marks states inconsistent with the focal player's type and action.
+        """
         pm = self.payoff_matrix
-        return {
-            "mutual_cooperation": (pm.reward, pm.reward),
-            "mutual_defection": (pm.punishment, pm.punishment),
-            "temptation_vs_sucker": (pm.temptation, pm.sucker),
-            "labels": {
-                "T": pm.temptation,
-                "R": pm.reward,
-                "P": pm.punishment,
-                "S": pm.sucker
-            }
-        }
+        opponents = self.num_p + self.num_q - 1
+        p_coop = np.arange(self.num_p + 1)
+        q_coop = np.arange(self.num_q + 1)
+        cooperators = np.add.outer(p_coop, q_coop)
+        
+        # A cooperating focal player is counted among the cooperators
+        others_if_cooperating = cooperators - 1
+        cooperate = (others_if_cooperating * pm.reward
+                     + (opponents - others_if_cooperating) * pm.sucker) / opponents
+        defect = (cooperators * pm.temptation
+                  + (opponents - cooperators) * pm.punishment) / opponents
+        
+        table = np.empty((2, 2, self.num_p + 1, self.num_q + 1))
+        table[:, 0] = defect
+        table[:, 1] = cooperate
+        
+        # The focal player's own action bounds its type's cooperator count
+        table[1, 1, 0, :] = np.nan        # p cooperates: num_p_coop >= 1
+        table[1, 0, self.num_p, :] = np.nan  # p defects: num_p_coop <= num_p - 1
+        table[0, 1, :, 0] = np.nan        # q cooperates: num_q_coop >= 1
+        table[0, 0, :, self.num_q] = np.nan  # q defects: num_q_coop <= num_q - 1
+        if self.num_p == 0:
+            table[1] = np.nan
+        if self.num_q == 0:
+            table[0] = np.nan
+        return table
+    
+    def calculate_group_payoffs(
+        self,
+        num_p_coop: int,
+        num_q_coop: int,
+        focal_is_p: bool,
+        focal_cooperates: bool
+    ) -> float:
+        """
+        Calculate a focal player's average payoff in a clustered state.
+        
+        Args:
+            num_p_coop: Number of cooperating type-p players, counting the
+                focal player if it is type p and cooperates
+            num_q_coop: Number of cooperating type-q players, counting the
+                focal player if it is type q and cooperates
+            focal_is_p: Whether the focal player is of type p
+            focal_cooperates: Whether the focal player cooperates
+            
+        Returns:
+            The focal player's payoff, averaged over all opponents
+        """
+        if not (0 <= num_p_coop <= self.num_p and 0 <= num_q_coop <= self.num_q):
+            raise ValueError("Cooperator counts out of range")
+        
+        payoff = self._table[int(focal_is_p), int(focal_cooperates), num_p_coop, num_q_coop]
+        if np.isnan(payoff):
+            raise ValueError("State is inconsistent with the focal player's type and action")
+        return float(payoff)
@@ -1,15 +1,29 @@
 """
 Data Logger
 
-Handles saving session data to JSON files in the data/sessions folder.
+Handles saving session data to the data/sessions folder.
+
+Finished sessions are appended, one JSON object per line, to a single
+long-lived log file (data/sessions/sessions.jsonl). Each session is written
+with a single os.write on an O_APPEND descriptor, so records from several
+worker processes never interleave. The log is fsynced every FLUSH_EVERY
+sessions, every FLUSH_INTERVAL seconds, and at exit, so a host crash loses
+at most the sessions of one batch. A line torn by a crash is terminated
+before the next append and skipped when reading.
+Sessions saved before the log existed remain readable from their own
+{session_id}.json files.
 """
 
-import json
+import atexit
 import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
+import orjson
+
 from backend.engine.state import RoundResult
 
 
@@ -17,6 +31,23 @@ from backend.engine.state import RoundResult
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data" / "sessions"
 
+# Legacy per-session file path, formatted with the session ID
+_FILEPATH_TEMPLATE = str(DATA_DIR / "{}.json")
+
+# Append-only session log
+SESSION_LOG = DATA_DIR / "sessions.jsonl"
+
+# Fsync the log after this many sessions or seconds, whichever comes first
+FLUSH_EVERY = 16
+FLUSH_INTERVAL = 5.0
+
+# Log state, guarded by _log_lock
+_log_lock = threading.Lock()
+_log_fd: Optional[int] = None  # O_APPEND descriptor, opened on first write
+_unflushed = 0  # Sessions written since the last fsync
+_log_index: Dict[str, int] = {}  # session_id -> byte offset of its line
+_indexed_bytes = 0  # Log prefix already covered by _log_index
+
 
 def ensure_data_dir() -> Path:
     """Ensure the data/sessions directory exists."""
@@ -24,6 +55,13 @@ def ensure_data_dir() -> Path:
     return DATA_DIR
 
 
+# Create the data directory once; save_session_data assumes it exists
+try:
+    ensure_data_dir()
+except OSError as e:
+    print(f"Warning: Failed to create data directory {DATA_DIR}: {e}")
+
+
 def save_session_data(
     session_id: str,
     config: Dict[str, Any],
@@ -34,7 +72,7 @@ def save_session_data(
     agent_type: str
 ) -> str:
     """
-    Save session data to a JSON file.
+    Append session data to the session log.
     
     Args:
         session_id: Unique session identifier
@@ -46,10 +84,8 @@ def save_session_data(
         agent_type: Type/strategy of the agent
         
     Returns:
-        Path to the saved file
+        Path to the session log
     """
-    ensure_data_dir()
-    
     # Build the session data structure
     session_data = {
         "session_id": session_id,
@@ -83,17 +119,20 @@ def save_session_data(
         }
         session_data["steps"].append(step_data)
     
-    # Save to file
-    filepath = DATA_DIR / f"{session_id}.json"
-    with open(filepath, "w") as f:
-        json.dump(session_data, f, indent=2)
-    
-    return str(filepath)
+    _append_to_log(orjson.dumps(session_data) + b"\n")
+    return str(SESSION_LOG)
+
+
+def flush_session_log() -> None:
+    """Fsync session log writes not yet synced to disk."""
+    with _log_lock:
+        if _log_fd is not None and _unflushed:
+            _sync_log()
 
 
 def load_session_data(session_id: str) -> Optional[Dict[str, Any]]:
     """
-    Load session data from a JSON file.
+    Load session data from the session log (or a legacy JSON file).
     
     Args:
         session_id: The session identifier
@@ -101,15 +140,92 @@ def load_session_data(session_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Session data dict if found, None otherwise
     """
-    filepath = DATA_DIR / f"{session_id}.json"
-    if not filepath.exists():
+    flush_session_log()
+    with _log_lock:
+        _index_log()
+        offset = _log_index.get(session_id)
+    
+    if offset is not None:
+        with open(SESSION_LOG, "rb") as f:
+            f.seek(offset)
+            return orjson.loads(f.readline())
+    
+    filepath = _FILEPATH_TEMPLATE.format(session_id)
+    if not os.path.exists(filepath):
         return None
     
-    with open(filepath, "r") as f:
-        return json.load(f)
+    with open(filepath, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def list_all_sessions() -> List[str]:
     """List all saved session IDs."""
+    flush_session_log()
+    with _log_lock:
+        _index_log()
+        session_ids = list(_log_index)
     ensure_data_dir()
-    return [f.stem for f in DATA_DIR.glob("*.json")]
+    return session_ids + [f.stem for f in DATA_DIR.glob("*.json")]
+
+
+def _append_to_log(line: bytes) -> None:
+    """Append one serialized session to the log, fsyncing in batches."""
+    global _log_fd, _unflushed
+    with _log_lock:
+        if _log_fd is None:
+            _log_fd = _open_log()
+            threading.Thread(target=_flush_periodically, daemon=True).start()
+        # One write per record: O_APPEND places it atomically at the end
+        os.write(_log_fd, line)
+        _unflushed += 1
+        if _unflushed >= FLUSH_EVERY:
+            _sync_log()
+
+
+def _open_log() -> int:
+    """Open the log for appending, terminating a line torn by a crash."""
+    fd = os.open(SESSION_LOG, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    with open(SESSION_LOG, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                os.write(fd, b"\n")
+    return fd
+
+
+def _sync_log() -> None:
+    """Fsync the log (caller holds _log_lock)."""
+    global _unflushed
+    os.fsync(_log_fd)
+    _unflushed = 0
+
+
+def _flush_periodically() -> None:
+    """Background loop bounding how long a saved session can stay unsynced."""
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush_session_log()
+
+
+def _index_log() -> None:
+    """Index log lines written since the last call (caller holds _log_lock)."""
+    global _indexed_bytes
+    if not SESSION_LOG.exists():
+        return
+    
+    with open(SESSION_LOG, "rb") as f:
+        f.seek(_indexed_bytes)
+        offset = _indexed_bytes
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Incomplete trailing line, may still be completed
+            try:
+                _log_index[orjson.loads(line)["session_id"]] = offset
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                print(f"Warning: Skipping unreadable session log line at byte {offset}")
+            offset += len(line)
+    _indexed_bytes = offset
+
+
+atexit.register(flush_session_log)
@@ -87,8 +87,9 @@ class TestTitForTatAgent:
         
         # After reset, first move should cooperate
         assert agent.select_action() == Action.COOPERATE
-        assert len(agent.history) == 0
-        assert len(agent.opponent_history) == 0
+        assert agent.rounds_played == 0
+        assert agent.last_action is None
+        assert agent.last_opponent_action is None
 
 
 class TestAlwaysCooperateAgent:
@@ -135,3 +136,11 @@ class TestRandomAgent:
         
         assert Action.COOPERATE in actions
         assert Action.DEFECT in actions
+    
+    def test_batch_actions_deterministic_with_seed(self):
+        """Batched actions are 0/1 codes and reproducible with a seed."""
+        actions1 = RandomAgent(seed=7).select_actions(50)
+        actions2 = RandomAgent(seed=7).select_actions(50)
+        
+        assert actions1.tolist() == actions2.tolist()
+        assert set(actions1.tolist()) == {0, 1}
@@ -0,0 +1,173 @@
+"""
+Tests for the API Routes and Session Store
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import session as session_store
+from backend.api.main import app
+from backend.engine.config import SimulationConfig
+from backend.engine.model import GameSession
+
+
+STATE_KEYS = {
+    "session_id", "current_round", "total_rounds", "agent_score", "human_score",
+    "agent_action", "waiting_for_human", "history", "game_over",
+    "agent_name", "agent_strategy", "payoff_matrix",
+}
+
+
+@pytest.fixture
+def client():
+    """Test client with an empty session store."""
+    session_store.clear_all_sessions()
+    yield TestClient(app)
+    session_store.clear_all_sessions()
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    """Record sessions saved at game end instead of writing them to disk."""
+    saved_ids = []
+    monkeypatch.setattr(GameSession, "save", lambda self: saved_ids.append(self.session_id))
+    return saved_ids
+
+
+def init_game(client, num_rounds: int = 2, agent_type: str = "tit_for_tat") -> str:
+    """Start a game and return its session ID."""
+    response = client.post(
+        "/simulation/init", json={"num_rounds": num_rounds, "agent_type": agent_type}
+    )
+    assert response.status_code == 200
+    return response.json()["session_id"]
+
+
+class TestRoutes:
+    """Tests for the simulation endpoints."""
+    
+    def test_init_response(self, client):
+        """Init returns the session ID and the initial state."""
+        response = client.post("/simulation/init", json={"num_rounds": 3})
+        body = response.json()
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert set(body) == {"session_id", "state"}
+        assert set(body["state"]) == STATE_KEYS
+        assert body["state"]["session_id"] == body["session_id"]
+        assert body["state"]["current_round"] == 0
+        assert body["state"]["total_rounds"] == 3
+        assert body["state"]["agent_action"] == "cooperate"
+        assert body["state"]["history"] == []
+    
+    def test_step_and_state(self, client, saved):
+        """A step returns the updated state, which the state endpoint also serves."""
+        session_id = init_game(client, num_rounds=3)
+        response = client.post(
+            "/simulation/step", json={"session_id": session_id, "action": "defect"}
+        )
+        body = response.json()
+        
+        assert response.status_code == 200
+        assert set(body) == {"state"}
+        state = body["state"]
+        assert set(state) == STATE_KEYS
+        assert state["current_round"] == 1
+        assert (state["agent_score"], state["human_score"]) == (0, 5)
+        assert state["history"] == [{
+            "round_number": 1,
+            "agent_action": "cooperate",
+            "human_action": "defect",
+            "agent_payoff": 0,
+            "human_payoff": 5,
+        }]
+        # TitForTat mirrors the defection next round
+        assert state["agent_action"] == "defect"
+        
+        assert client.get(f"/simulation/state/{session_id}").json() == state
+        assert saved == []
+    
+    def test_final_step_saves_and_removes_session(self, client, saved):
+        """The last step returns the final state, queues the save and drops the session."""
+        session_id = init_game(client, num_rounds=2)
+        client.post("/simulation/step", json={"session_id": session_id, "action": "cooperate"})
+        response = client.post(
+            "/simulation/step", json={"session_id": session_id, "action": "cooperate"}
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["state"]["game_over"] is True
+        assert saved == [session_id]
+        
+        step = client.post("/simulation/step", json={"session_id": session_id, "action": "defect"})
+        assert step.status_code == 404
+        assert client.get(f"/simulation/state/{session_id}").status_code == 404
+        assert saved == [session_id]
+    
+    def test_unknown_session(self, client):
+        """Unknown session IDs return 404."""
+        step = client.post("/simulation/step", json={"session_id": "missing", "action": "defect"})
+        assert step.status_code == 404
+        assert client.get("/simulation/state/missing").status_code == 404
+    
+    def test_invalid_action(self, client):
+        """Actions other than cooperate/defect are rejected by validation."""
+        session_id = init_game(client)
+        response = client.post(
+            "/simulation/step", json={"session_id": session_id, "action": "Cooperate"}
+        )
+        assert response.status_code == 422
+
+
+def same_shard_ids(count: int) -> list:
+    """Session IDs that all hash to the same shard."""
+    target = session_store._shard_for("s0")
+    ids = (f"s{i}" for i in range(100_000))
+    return [sid for sid in ids if session_store._shard_for(sid) is target][:count]
+
+
+class TestSessionStore:
+    """Tests for the sharded LRU session store."""
+    
+    @pytest.fixture(autouse=True)
+    def small_shards(self, monkeypatch):
+        """Limit every shard to two sessions."""
+        monkeypatch.setattr(session_store, "_SHARD_CAPACITY", 2)
+        session_store.clear_all_sessions()
+        yield
+        session_store.clear_all_sessions()
+    
+    def make(self, session_id: str) -> GameSession:
+        """Create a session with a chosen ID."""
+        return GameSession.create(SimulationConfig(num_rounds=2), session_id=session_id)
+    
+    def test_evicts_least_recently_stored(self):
+        """A full shard drops its oldest session."""
+        first, second, third = same_shard_ids(3)
+        for session_id in (first, second, third):
+            session_store.store_session(self.make(session_id))
+        
+        assert session_store.get_session(first) is None
+        assert session_store.get_session(second) is not None
+        assert session_store.get_session(third) is not None
+    
+    def test_read_refreshes_recency(self):
+        """Reading a session protects it from the next eviction."""
+        first, second, third = same_shard_ids(3)
+        session_store.store_session(self.make(first))
+        session_store.store_session(self.make(second))
+        session_store.get_session(first)
+        session_store.store_session(self.make(third))
+        
+        assert session_store.get_session(first) is not None
+        assert session_store.get_session(second) is None
+    
+    def test_evicted_session_returns_404(self, client):
+        """Evicted sessions are reported as not found by the API."""
+        first, second, third = same_shard_ids(3)
+        for session_id in (first, second, third):
+            session_store.store_session(self.make(session_id))
+        
+        assert client.get(f"/simulation/state/{first}").status_code == 404
+        assert client.get(f"/simulation/state/{third}").status_code == 200
@@ -2,14 +2,43 @@
 Tests for Prisoners Dilemma Environment
 """
 
+import pickle
+from itertools import product
+
+import numpy as np
 import pytest
+from hypothesis import given, settings, strategies as st
+
 from backend.environment import (
     Action, 
+    AgentState,
+    NPlayerPDEnvironment,
     PayoffMatrix, 
-    PrisonersDilemmaEnvironment
+    PrisonersDilemmaEnvironment,
+    action_from_string
 )
 
 
+C, D = Action.COOPERATE, Action.DEFECT
+actions = st.sampled_from(list(Action))
+
+
+@st.composite
+def payoff_matrices(draw):
+    """Valid payoff matrices: S < P < R < T with 2R > T + S."""
+    # Wide enough to exceed int16/int32 payoff storage
+    sucker = draw(st.integers(-10**12, 10**12))
+    gap_ps = draw(st.integers(1, 10**12))
+    gap_rp = draw(st.integers(1, 10**12))
+    # 2R > T + S reduces to T - R < (P - S) + (R - P)
+    gap_tr = draw(st.integers(1, gap_ps + gap_rp - 1))
+    punishment = sucker + gap_ps
+    reward = punishment + gap_rp
+    return PayoffMatrix(
+        temptation=reward + gap_tr, reward=reward, punishment=punishment, sucker=sucker
+    )
+
+
 class TestPayoffMatrix:
     """Tests for the PayoffMatrix dataclass."""
     
@@ -26,44 +55,127 @@ class TestPayoffMatrix:
         # Valid: T=5 > R=3 > P=1 > S=0
         pm = PayoffMatrix(temptation=5, reward=3, punishment=1, sucker=0)
         assert pm.temptation > pm.reward > pm.punishment > pm.sucker
+        
+        # Invalid: R=1 < P=2
+        with pytest.raises(ValueError, match="T>R>P>S"):
+            PayoffMatrix(temptation=5, reward=1, punishment=2, sucker=0)
     
     def test_constraint_2r_greater_than_t_plus_s(self):
         """Test that 2R > T + S constraint is satisfied."""
         pm = PayoffMatrix()
         assert 2 * pm.reward > pm.temptation + pm.sucker
+        
+        # Invalid: 2R=6 < T+S=10, although T > R > P > S
+        with pytest.raises(ValueError, match=r"2R>T\+S"):
+            PayoffMatrix(temptation=9, reward=3, punishment=2, sucker=1)
+
+
+@pytest.fixture(scope="module")
+def env():
+    """Create a default environment (immutable, so shared by the module)."""
+    return PrisonersDilemmaEnvironment()
 
 
 class TestPrisonersDilemmaEnvironment:
     """Tests for the game environment."""
     
-    @pytest.fixture
-    def env(self):
-        """Create a default environment."""
-        return PrisonersDilemmaEnvironment()
-    
-    def test_mutual_cooperation(self, env):
-        """Both players cooperate: both get R=3."""
-        p1, p2 = env.calculate_payoffs(Action.COOPERATE, Action.COOPERATE)
-        assert p1 == 3
-        assert p2 == 3
-    
-    def test_mutual_defection(self, env):
-        """Both players defect: both get P=1."""
-        p1, p2 = env.calculate_payoffs(Action.DEFECT, Action.DEFECT)
-        assert p1 == 1
-        assert p2 == 1
-    
-    def test_player1_defects_player2_cooperates(self, env):
-        """Player 1 defects, Player 2 cooperates: T=5 vs S=0."""
-        p1, p2 = env.calculate_payoffs(Action.DEFECT, Action.COOPERATE)
-        assert p1 == 5  # Temptation
-        assert p2 == 0  # Sucker
-    
-    def test_player1_cooperates_player2_defects(self, env):
-        """Player 1 cooperates, Player 2 defects: S=0 vs T=5."""
-        p1, p2 = env.calculate_payoffs(Action.COOPERATE, Action.DEFECT)
-        assert p1 == 0  # Sucker
-        assert p2 == 5  # Temptation
+    @pytest.mark.parametrize("a1,a2,e1,e2", [
+        (Action.COOPERATE, Action.COOPERATE, 3, 3),  # Both get R
+        (Action.DEFECT, Action.DEFECT, 1, 1),        # Both get P
+        (Action.DEFECT, Action.COOPERATE, 5, 0),     # T vs S
+        (Action.COOPERATE, Action.DEFECT, 0, 5),     # S vs T
+    ])
+    def test_payoffs(self, env, a1, a2, e1, e2):
+        """Payoffs for every combination of actions."""
+        p1, p2 = env.calculate_payoffs(a1, a2)
+        assert (p1, p2) == (e1, e2)
+    
+    def test_payoff_table(self, env):
+        """The array table holds (player1, player2) payoffs per action pair."""
+        assert env.table.tolist() == [
+            [[3, 3], [0, 5]],
+            [[5, 0], [1, 1]],
+        ]
+    
+    def test_tables_shared_between_instances(self, env):
+        """Environments with equal payoffs share one read-only table."""
+        other = PrisonersDilemmaEnvironment(PayoffMatrix())
+        assert other.table is env.table
+        assert not env.table.flags.writeable
+    
+    def test_integer_actions_match_enum(self, env):
+        """Integer-coded payoffs match the enum-based calculation."""
+        for a1 in Action:
+            for a2 in Action:
+                assert env.calculate_payoffs_int(int(a1), int(a2)) == env.calculate_payoffs(a1, a2)
+    
+    def test_subclass_overrides_payoffs(self):
+        """Subclasses can override calculate_payoffs, including for integer callers."""
+        class Fixed(PrisonersDilemmaEnvironment):
+            def calculate_payoffs(self, action1, action2):
+                return (99, 99)
+        
+        fixed = Fixed()
+        assert fixed.calculate_payoffs(Action.COOPERATE, Action.COOPERATE) == (99, 99)
+        assert fixed.calculate_payoffs_int(0, 0) == (99, 99)
+    
+    def test_pickle_round_trip(self):
+        """Environments pickle, e.g. for multiprocessing."""
+        pm = PayoffMatrix(temptation=7, reward=4, punishment=2, sucker=0)
+        restored = pickle.loads(pickle.dumps(PrisonersDilemmaEnvironment(pm)))
+        assert restored.payoff_matrix == pm
+        assert restored.calculate_payoffs(Action.DEFECT, Action.COOPERATE) == (7, 0)
+        assert restored.calculate_payoffs_int(0, 0) == (4, 4)
+    
+    def test_batch_payoffs(self, env):
+        """Batch payoffs match all four action combinations in one call."""
+        a1 = np.array([0, 1, 1, 0], dtype=np.uint8)
+        a2 = np.array([0, 1, 0, 1], dtype=np.uint8)
+        p1, p2 = env.calculate_payoffs_batch(a1, a2)
+        assert (p1 == [3, 1, 5, 0]).all()
+        assert (p2 == [3, 1, 0, 5]).all()
+    
+    def test_large_payoffs(self):
+        """Payoffs beyond 16 bits are stored without overflow."""
+        pm = PayoffMatrix(temptation=50000, reward=40000, punishment=100, sucker=0)
+        large_env = PrisonersDilemmaEnvironment(pm)
+        assert large_env.calculate_payoffs(Action.DEFECT, Action.COOPERATE) == (50000, 0)
+        assert int(large_env.table[0, 0, 0]) == 40000
+    
+    def test_run_match_totals(self, env):
+        """Match totals equal the sum of per-round payoffs."""
+        rng = np.random.default_rng(0)
+        a1 = rng.integers(0, 2, size=50, dtype=np.int8)
+        a2 = rng.integers(0, 2, size=50, dtype=np.int8)
+        
+        rounds = [env.calculate_payoffs(x, y) for x, y in zip(a1.tolist(), a2.tolist())]
+        expected = (sum(p for p, _ in rounds), sum(p for _, p in rounds))
+        assert env.run_match(a1, a2) == expected
+    
+    def test_play_round_accumulates_scalar_payoffs(self, env):
+        """Array-based rounds reproduce the scalar payoffs for every action pair."""
+        pairs = list(product(Action, repeat=2))
+        players, opponents = AgentState(len(pairs)), AgentState(len(pairs))
+        players.last_action[:] = [a1 for a1, _ in pairs]
+        opponents.last_action[:] = [a2 for _, a2 in pairs]
+        
+        env.play_round(players, opponents)
+        env.play_round(players, opponents)
+        
+        for i, (a1, a2) in enumerate(pairs):
+            p1, p2 = env.calculate_payoffs(a1, a2)
+            assert (players.score[i], opponents.score[i]) == (2 * p1, 2 * p2)
+    
+    def test_run_tournament_matches_run_match(self, env):
+        """Every tournament entry equals the total of the corresponding match."""
+        rng = np.random.default_rng(1)
+        histories = rng.integers(0, 2, size=(6, 40), dtype=np.int8)
+        
+        scores = env.run_tournament(histories)
+        assert scores.shape == (6, 6)
+        for i in range(6):
+            for j in range(6):
+                assert scores[i, j] == env.run_match(histories[i], histories[j])[0]
     
     def test_get_payoff_description(self, env):
         """Test payoff description for API."""
@@ -72,17 +184,101 @@ class TestPrisonersDilemmaEnvironment:
         assert "mutual_defection" in desc
         assert "temptation_vs_sucker" in desc
         assert desc["labels"]["T"] == 5
+        assert env.get_payoff_description() is desc
+
+
+class TestNPlayerPDEnvironment:
+    """Tests for the clustered n-player environment."""
+    
+    NUM_P, NUM_Q = 2, 3
+    
+    @pytest.fixture(scope="class")
+    @classmethod
+    def group_env(cls):
+        """Create a group of 2 type-p and 3 type-q players."""
+        return NPlayerPDEnvironment(cls.NUM_P, cls.NUM_Q)
+    
+    def test_matches_full_enumeration(self, group_env, env):
+        """Clustered payoffs equal pairwise averages over all 2^n profiles."""
+        n = self.NUM_P + self.NUM_Q
+        for profile in product(Action, repeat=n):
+            num_p_coop = profile[:self.NUM_P].count(Action.COOPERATE)
+            num_q_coop = profile[self.NUM_P:].count(Action.COOPERATE)
+            for focal in range(n):
+                expected = sum(
+                    env.calculate_payoffs(profile[focal], profile[other])[0]
+                    for other in range(n) if other != focal
+                ) / (n - 1)
+                payoff = group_env.calculate_group_payoffs(
+                    num_p_coop, num_q_coop,
+                    focal_is_p=focal < self.NUM_P,
+                    focal_cooperates=profile[focal] == Action.COOPERATE
+                )
+                assert payoff == pytest.approx(expected)
+    
+    def test_permuted_states_share_payoff(self, group_env):
+        """Profiles differing only by a permutation within types give the same payoff."""
+        C, D = Action.COOPERATE, Action.DEFECT
+        first = (C, D, C, D, D)   # focal p player 0 cooperates
+        second = (C, D, D, D, C)  # q cooperators permuted
+        
+        payoffs = [
+            group_env.calculate_group_payoffs(
+                profile[:self.NUM_P].count(C), profile[self.NUM_P:].count(C),
+                focal_is_p=True, focal_cooperates=True
+            )
+            for profile in (first, second)
+        ]
+        assert payoffs[0] == payoffs[1]
+    
+    def test_rejects_inconsistent_state(self, group_env):
+        """A cooperating type-p focal player needs at least one p cooperator."""
+        with pytest.raises(ValueError):
+            group_env.calculate_group_payoffs(0, 1, focal_is_p=True, focal_cooperates=True)
+
+
+class TestPayoffProperties:
+    """Property-based checks of every payoff kernel over all inputs."""
+    
+    @given(actions, actions)
+    def test_payoff_matches_reference(self, env, a1, a2):
+        """The default kernel matches the classic payoff table."""
+        ref = {(C, C): (3, 3), (C, D): (0, 5), (D, C): (5, 0), (D, D): (1, 1)}
+        assert env.calculate_payoffs(a1, a2) == ref[(a1, a2)]
+    
+    # The first run_match call may compile the Numba kernel
+    @settings(deadline=None)
+    @given(payoff_matrices(), actions, actions)
+    def test_kernels_agree(self, pm, a1, a2):
+        """Scalar, batch and match kernels agree for any valid matrix."""
+        ref = {
+            (C, C): (pm.reward, pm.reward),
+            (C, D): (pm.sucker, pm.temptation),
+            (D, C): (pm.temptation, pm.sucker),
+            (D, D): (pm.punishment, pm.punishment),
+        }[(a1, a2)]
+        env = PrisonersDilemmaEnvironment(pm)
+        
+        assert env.calculate_payoffs(a1, a2) == ref
+        batch1, batch2 = env.calculate_payoffs_batch(np.array([a1]), np.array([a2]))
+        assert (int(batch1[0]), int(batch2[0])) == ref
+        assert env.run_match(np.array([a1]), np.array([a2])) == ref
 
 
 class TestAction:
     """Tests for the Action enum."""
     
-    def test_action_values(self):
-        """Test action string values."""
-        assert Action.COOPERATE.value == "cooperate"
-        assert Action.DEFECT.value == "defect"
+    @pytest.mark.parametrize("action,value,name", [
+        (Action.COOPERATE, 0, "cooperate"),
+        (Action.DEFECT, 1, "defect"),
+    ])
+    def test_action_encoding(self, action, value, name):
+        """Test action integer values, names, and creation from strings."""
+        assert int(action) == value
+        assert action.name.lower() == name
+        assert action_from_string(name) is action
     
-    def test_action_from_string(self):
-        """Test creating actions from strings."""
-        assert Action("cooperate") == Action.COOPERATE
-        assert Action("defect") == Action.DEFECT
+    def test_action_from_string_rejects_unknown(self):
+        """Only the lower-case action names are accepted."""
+        with pytest.raises(KeyError):
+            action_from_string("Cooperate")
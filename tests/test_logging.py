@@ -0,0 +1,131 @@
+"""
+Tests for the Session Data Logger
+"""
+
+import os
+import time
+
+import orjson
+import pytest
+
+from backend.engine.state import ActionType, RoundResult
+import backend.logging as session_logging
+
+_flush_periodically = session_logging._flush_periodically
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    """Point the logger at an empty temporary data directory with fresh log state."""
+    monkeypatch.setattr(session_logging, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(session_logging, "SESSION_LOG", tmp_path / "sessions.jsonl")
+    monkeypatch.setattr(session_logging, "_FILEPATH_TEMPLATE", str(tmp_path / "{}.json"))
+    monkeypatch.setattr(session_logging, "_log_fd", None)
+    monkeypatch.setattr(session_logging, "_unflushed", 0)
+    monkeypatch.setattr(session_logging, "_log_index", {})
+    monkeypatch.setattr(session_logging, "_indexed_bytes", 0)
+    # No background flusher unless a test asks for one, so flushes are deterministic
+    monkeypatch.setattr(session_logging, "_flush_periodically", lambda: None)
+    yield tmp_path
+    if session_logging._log_fd is not None:
+        os.close(session_logging._log_fd)
+
+
+def save(session_id: str, human_score: int = 3) -> None:
+    """Save a one-round session."""
+    history = [RoundResult(
+        round_number=0,
+        agent_action=ActionType.COOPERATE,
+        human_action=ActionType.DEFECT,
+        agent_payoff=0,
+        human_payoff=human_score
+    )]
+    session_logging.save_session_data(
+        session_id, {"num_rounds": 1}, history,
+        agent_score=0, human_score=human_score,
+        agent_name="TitForTat", agent_type="tit_for_tat"
+    )
+
+
+class TestSessionLog:
+    """Tests for the append-only session log."""
+    
+    def test_save_and_load(self, log_dir):
+        """Saved sessions are loaded back by ID and listed."""
+        for i in range(5):
+            save(f"s{i}", human_score=i)
+        
+        for i in range(5):
+            data = session_logging.load_session_data(f"s{i}")
+            assert data["session_id"] == f"s{i}"
+            assert data["final_scores"]["human"] == i
+        assert session_logging.load_session_data("missing") is None
+        assert sorted(session_logging.list_all_sessions()) == [f"s{i}" for i in range(5)]
+    
+    def test_index_picks_up_later_sessions(self, log_dir):
+        """Sessions appended after the log was indexed are found too."""
+        save("first")
+        assert session_logging.load_session_data("first") is not None
+        save("second")
+        assert session_logging.load_session_data("second")["session_id"] == "second"
+    
+    def test_batched_fsync(self, log_dir, monkeypatch):
+        """Records are written at once but fsynced every FLUSH_EVERY sessions."""
+        monkeypatch.setattr(session_logging, "FLUSH_EVERY", 3)
+        synced = []
+        monkeypatch.setattr(os, "fsync", synced.append)
+        log = log_dir / "sessions.jsonl"
+        
+        save("a")
+        save("b")
+        assert log.read_bytes().count(b"\n") == 2
+        assert synced == []
+        save("c")
+        assert len(synced) == 1
+        
+        save("d")
+        session_logging.flush_session_log()
+        assert len(synced) == 2
+    
+    def test_periodic_fsync(self, log_dir, monkeypatch):
+        """The background flusher syncs sessions without further saves."""
+        monkeypatch.setattr(session_logging, "FLUSH_INTERVAL", 0.01)
+        monkeypatch.setattr(session_logging, "_flush_periodically", _flush_periodically)
+        synced = []
+        monkeypatch.setattr(os, "fsync", synced.append)
+        
+        save("a")
+        deadline = time.monotonic() + 5
+        while not synced and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert synced
+    
+    def test_legacy_session_file(self, log_dir):
+        """Sessions saved as individual JSON files are still loaded and listed."""
+        (log_dir / "legacy.json").write_bytes(orjson.dumps({"session_id": "legacy"}))
+        save("new")
+        
+        assert session_logging.load_session_data("legacy") == {"session_id": "legacy"}
+        assert sorted(session_logging.list_all_sessions()) == ["legacy", "new"]
+    
+    def test_ignores_incomplete_trailing_line(self, log_dir):
+        """A partially written last line (e.g. after a crash) is skipped."""
+        save("complete")
+        session_logging.flush_session_log()
+        with open(log_dir / "sessions.jsonl", "ab") as f:
+            f.write(b'{"session_id": "partial", "ste')
+        
+        assert session_logging.list_all_sessions() == ["complete"]
+        assert session_logging.load_session_data("partial") is None
+    
+    def test_append_after_torn_line(self, log_dir):
+        """A log left with a torn last line by a crash stays readable after new saves."""
+        valid = orjson.dumps({"session_id": "before"}) + b"\n"
+        (log_dir / "sessions.jsonl").write_bytes(valid + b'{"session_id": "torn", "ste')
+        
+        save("after")
+        
+        assert session_logging.list_all_sessions() == ["before", "after"]
+        assert session_logging.load_session_data("before") == {"session_id": "before"}
+        assert session_logging.load_session_data("after")["session_id"] == "after"
+        assert session_logging.load_session_data("torn") is None
@@ -0,0 +1,171 @@
+"""
+Tests for the Game Session Model
+"""
+
+import numpy as np
+import orjson
+import pytest
+
+from backend.agents import TitForTatAgent
+from backend.engine.config import PayoffConfig, SimulationConfig
+from backend.engine.model import GameSession
+from backend.environment import Action, PrisonersDilemmaEnvironment
+
+
+def make_session(agent_type: str, num_rounds: int = 6) -> GameSession:
+    """Create a session against the given agent type."""
+    return GameSession.create(
+        SimulationConfig(num_rounds=num_rounds, agent_type=agent_type),
+        session_id="test"
+    )
+
+
+class TestRunBatch:
+    """Tests for vectorized multi-round play."""
+    
+    HUMAN = ["defect", "cooperate", "defect", "defect", "cooperate", "cooperate"]
+    
+    @pytest.mark.parametrize("agent_type", ["tit_for_tat", "always_cooperate", "always_defect"])
+    def test_matches_step_by_step(self, agent_type):
+        """A batch produces the same history and scores as individual steps."""
+        stepped = make_session(agent_type)
+        for action in self.HUMAN:
+            stepped.step(action)
+        
+        batched = make_session(agent_type)
+        codes = np.array([0 if a == "cooperate" else 1 for a in self.HUMAN])
+        pairs = batched.run_batch(codes)
+        
+        assert batched.history == stepped.history
+        assert batched.agent_score == stepped.agent_score
+        assert batched.human_score == stepped.human_score
+        assert pairs.tolist() == [[r.agent_payoff, r.human_payoff] for r in stepped.history]
+        assert batched.is_game_over()
+        for session in (stepped, batched):
+            assert session.agent.rounds_played == len(self.HUMAN)
+            assert session.agent.last_opponent_action == Action.COOPERATE
+        assert batched.agent.last_action == stepped.agent.last_action
+    
+    def test_continues_after_steps(self):
+        """A batch picks up TitForTat's reaction to the previous step."""
+        session = make_session("tit_for_tat", num_rounds=3)
+        session.step("defect")
+        pairs = session.run_batch(np.array([0, 0]))
+        
+        # Agent mirrors the earlier defection, then cooperates
+        assert pairs.tolist() == [[5, 0], [3, 3]]
+        assert session.current_round == 3
+    
+    def test_random_agent(self):
+        """Random agents are batched with consistent history and scores."""
+        session = make_session("random")
+        pairs = session.run_batch(np.ones(6, dtype=np.int8))
+        
+        # Against a defector the agent scores P when defecting, S when cooperating
+        agent_actions = [r.agent_action.value for r in session.history]
+        expected = [1 if a == "defect" else 0 for a in agent_actions]
+        assert pairs[:, 0].tolist() == expected
+        assert session.agent_score == sum(expected)
+    
+    @pytest.mark.parametrize("agent_type", ["tit_for_tat", "always_defect", "random"])
+    def test_steps_update_builtin_agents(self, agent_type):
+        """Built-in agents track rounds and last actions like any other agent."""
+        session = make_session(agent_type)
+        session.step("defect")
+        session.step("cooperate")
+        
+        assert session.agent.rounds_played == 2
+        assert session.agent.last_opponent_action == Action.COOPERATE
+        assert session.agent.last_action.name.lower() == session.history[-1].agent_action.value
+        assert session.agent.get_info()["rounds_played"] == 2
+    
+    def test_large_payoffs(self):
+        """Payoffs beyond 16 bits are recorded and summed without overflow."""
+        payoffs = PayoffConfig(temptation=50000, reward=40000, punishment=100, sucker=0)
+        session = GameSession.create(
+            SimulationConfig(num_rounds=3, agent_type="always_cooperate", payoffs=payoffs),
+            session_id="test"
+        )
+        session.step("defect")
+        pairs = session.run_batch(np.array([0, 0]))
+        
+        assert pairs.tolist() == [[40000, 40000], [40000, 40000]]
+        assert [r.human_payoff for r in session.history] == [50000, 40000, 40000]
+        assert session.human_score == 130000
+    
+    def test_rejects_custom_agent(self):
+        """Agents without a vectorized strategy cannot be batched."""
+        class CustomAgent(TitForTatAgent):
+            pass
+        
+        config = SimulationConfig(num_rounds=3)
+        session = GameSession("test", config, CustomAgent(), PrisonersDilemmaEnvironment())
+        with pytest.raises(ValueError):
+            session.run_batch(np.zeros(3, dtype=np.int8))
+    
+    @pytest.mark.parametrize("actions", [[256, 1, 0, 1], [-1, 0, 0, 0], [0.7, 1.0, 0.0, 1.0]])
+    def test_rejects_invalid_actions(self, actions):
+        """Actions must be integers 0 or 1 before any narrowing cast."""
+        session = make_session("tit_for_tat")
+        with pytest.raises(ValueError):
+            session.run_batch(np.array(actions))
+        assert session.current_round == 0
+    
+    def test_rejects_too_many_rounds(self):
+        """A batch cannot run past the end of the game."""
+        session = make_session("tit_for_tat", num_rounds=2)
+        with pytest.raises(ValueError):
+            session.run_batch(np.zeros(3, dtype=np.int8))
+
+
+class TestStateCache:
+    """Tests for GameState caching between moves."""
+    
+    def test_state_reused_until_step(self):
+        """get_state() is rebuilt only after the game advances."""
+        session = make_session("tit_for_tat")
+        state = session.get_state()
+        assert session.get_state() is state
+        
+        new_state = session.step("defect")
+        assert new_state is not state
+        assert new_state.current_round == 1
+        assert session.get_state() is new_state
+    
+    def test_state_json_reused_until_step(self):
+        """get_state_json() is re-serialized only after the game advances."""
+        session = make_session("tit_for_tat")
+        state_json = session.get_state_json()
+        assert session.get_state_json() is state_json
+        
+        session.step("defect")
+        assert orjson.loads(session.get_state_json())["current_round"] == 1
+        
+        session.run_batch(np.array([0]))
+        assert orjson.loads(session.get_state_json())["current_round"] == 2
+
+    def test_state_json_matches_model(self):
+        """The spliced JSON state serializes the same data as GameState."""
+        session = make_session("tit_for_tat")
+        session.step("defect")
+        session.run_batch(np.array([0, 1]))
+        session.step("cooperate")
+        
+        expected = session.get_state().model_dump(mode="json")
+        assert orjson.loads(session.get_state_json()) == expected
+
+
+class TestCreate:
+    """Tests for the GameSession factory."""
+    
+    @pytest.mark.parametrize("num_rounds", [-1, 0, 101])
+    def test_rejects_invalid_num_rounds(self, num_rounds):
+        """Configurations outside 1-100 rounds fail at construction."""
+        with pytest.raises(ValueError, match="num_rounds"):
+            SimulationConfig(num_rounds=num_rounds)
+    
+    def test_sessions_share_environment(self):
+        """Sessions with the same payoffs reuse one environment."""
+        first = make_session("tit_for_tat")
+        second = make_session("always_defect")
+        assert first.environment is second.environment